@@ -1,17 +1,85 @@
+import asyncio
+import csv
 import os
+import threading
 import time
-from typing import List, Tuple, Dict
+from typing import Any, List, Tuple, Dict
 from collections import defaultdict
-from statistics import mean
+from concurrent.futures import ThreadPoolExecutor
+from kubernetes import watch
 from kubernetes.client import AppsV1Api, CoreV1Api
-from app.src.utils.logging_util import get_logger
-from rich.table import Table
-from rich.console import Console
-import dns.resolver
+from kubernetes.client.rest import ApiException
+from urllib3.exceptions import HTTPError
+from src.utils.logging_util import get_logger
 
+# Rich and dnspython are imported inside the functions that use them, so importing
+# this module (e.g. during pytest collection) does not pay for either.
 
 logger = get_logger(__name__)
-console = Console()
+
+# Shared across calls so /etc/resolv.conf is parsed once per process; see _get_resolver()
+# and _get_async_resolver()
+_RESOLVER = None
+_ASYNC_RESOLVER = None
+
+# Seconds track_scaling_telemetry waits, in total, for its watch threads after stopping them
+WATCHER_JOIN_TIMEOUT = 1.0
+
+
+def _watch_resource(list_func, on_event, stop_event, deadline, interval, resource_version=None, **kwargs):
+    """
+    Poll-then-watch loop for a Kubernetes list endpoint.
+
+    Streams ADDED/MODIFIED/DELETED events from `resource_version` until `stop_event`
+    is set or `deadline` passes. An expired resourceVersion (410 Gone) or a dropped
+    stream falls back to a fresh list, which re-seeds state before watching again.
+    Lists pass resource_version="0" so the apiserver serves them from its watch
+    cache instead of a quorum read against etcd. `on_event(event_type, objects)`
+    receives a whole relisting at once as "SYNC" (the complete current set, so
+    callers can drop objects deleted while the watch was down), or a one-item
+    list per watch event.
+    """
+    while not stop_event.is_set() and time.monotonic() < deadline:
+        try:
+            if resource_version is None:
+                listing = list_func(resource_version="0", **kwargs)
+                on_event("SYNC", listing.items)
+                resource_version = listing.metadata.resource_version
+
+            remaining = int(deadline - time.monotonic())
+            if remaining <= 0:
+                break
+
+            # Rounds last at most `interval` seconds, so a set stop_event is noticed even
+            # when no events arrive; the next round resumes from the last resourceVersion
+            w = watch.Watch()
+            round_seconds = max(1, min(remaining, int(interval)))
+            # _request_timeout bounds the socket reads too, so a hung connection can't outlast the round
+            for event in w.stream(
+                list_func,
+                resource_version=resource_version,
+                timeout_seconds=round_seconds,
+                _request_timeout=round_seconds + interval,
+                **kwargs,
+            ):
+                if event["type"] in ("ADDED", "MODIFIED", "DELETED"):
+                    on_event(event["type"], [event["object"]])
+                resource_version = w.resource_version
+                if stop_event.is_set():
+                    w.stop()
+        except ApiException as e:
+            if e.status == 410:
+                logger.debug(f"Watch on {list_func.__name__} expired (410 Gone); relisting.")
+            else:
+                logger.warning(f"⚠️ Watch on {list_func.__name__} failed ({e.status}); falling back to polling.")
+                stop_event.wait(interval)
+            resource_version = None
+        except HTTPError as e:
+            # Transport failures only (dropped stream, read timeout, refused connection);
+            # errors raised by on_event are bugs and propagate
+            logger.warning(f"⚠️ Watch on {list_func.__name__} dropped: {e}; falling back to polling.")
+            stop_event.wait(interval)
+            resource_version = None
 
 
 def track_scaling_telemetry(
@@ -23,47 +91,119 @@ def track_scaling_telemetry(
     timeout: int = 600,
     interval: int = 10,
     write_csv: bool = True,
+    summary: bool = False,
 ) -> Tuple[List[Tuple[int, int, int, int]], Dict[str, int]]:
     """
     Tracks the scaling progress of a Kubernetes Deployment in terms of pod availability and node readiness.
-    
+
+    Node and Deployment state is kept current by two background watch streams;
+    the main loop only samples that state every `interval` seconds. Pass
+    `summary=True` to also print a Rich table of the results.
+
     Returns:
         - time_series: List of (elapsed_time_sec, available_replicas, total_nodes, ready_nodes)
         - node_ready_durations: Dict[node_name] = time_to_ready_sec
     """
 
-    start_time = time.time()
-    initial_nodes = {n.metadata.name for n in core_api.list_node().items}
+    start_time = time.monotonic()
+    deadline = start_time + timeout
     node_first_seen = dict()
     node_ready_time = dict()
+    all_nodes = set()
     time_series = []
+    available = 0
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def on_node_events(event_type, nodes):
+        elapsed = int(time.monotonic() - start_time)
+        # Local aliases keep the per-node loop on fast local lookups
+        ready_time = node_ready_time
+        add_node = all_nodes.add
+        first_seen_setdefault = node_first_seen.setdefault
+        with lock:
+            if done.is_set():
+                return
+            if event_type == "DELETED":
+                for node in nodes:
+                    all_nodes.discard(node.metadata.name)
+                return
+            if event_type == "SYNC":
+                # A relist is the full node set; anything missing was deleted while the watch was down
+                all_nodes.clear()
+
+            for node in nodes:
+                name = node.metadata.name
+                add_node(name)
+                first_seen_setdefault(name, elapsed)
+
+                # Ready time is recorded once; later events for the node need no condition scan
+                if name in ready_time:
+                    continue
+
+                conditions = node.status.conditions
+                if conditions and any(c.type == "Ready" and c.status == "True" for c in conditions):
+                    ready_time[name] = elapsed
+
+    def on_deployment_events(event_type, deployments):
+        nonlocal available
+        if event_type == "DELETED" or done.is_set():
+            return
+        for deployment in deployments:
+            available = deployment.status.available_replicas or 0
+        if available >= target_replicas:
+            done.set()
 
     logger.info("📊 Starting GKE scaling telemetry...")
 
-    while time.time() - start_time < timeout:
-        elapsed = int(time.time() - start_time)
-
-        # Pod availability
-        dep_status = apps_api.read_namespaced_deployment(name=deployment_name, namespace=namespace)
-        available = dep_status.status.available_replicas or 0
-
-        # Node state
-        current_nodes = core_api.list_node().items
-        all_nodes = {n.metadata.name for n in current_nodes}
-        new_nodes = all_nodes - initial_nodes
-
-        for node in current_nodes:
-            name = node.metadata.name
-            if name not in node_first_seen:
-                node_first_seen[name] = elapsed
-
-            for condition in node.status.conditions:
-                if condition.type == "Ready" and condition.status == "True":
-                    if name not in node_ready_time:
-                        node_ready_time[name] = elapsed
+    # Seed state with one list per resource, issued concurrently; the watches resume from these resourceVersions
+    deployment_selector = f"metadata.name={deployment_name}"
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        node_future = pool.submit(core_api.list_node, resource_version="0")
+        deployment_future = pool.submit(
+            apps_api.list_namespaced_deployment,
+            namespace=namespace,
+            field_selector=deployment_selector,
+            resource_version="0",
+        )
+        node_list = node_future.result()
+        deployment_list = deployment_future.result()
+
+    on_node_events("ADDED", node_list.items)
+    on_deployment_events("ADDED", deployment_list.items)
+    initial_nodes = set(all_nodes)
+
+    watchers = [
+        threading.Thread(
+            target=_watch_resource,
+            args=(core_api.list_node, on_node_events, done, deadline, interval),
+            kwargs={"resource_version": node_list.metadata.resource_version},
+            daemon=True,
+        ),
+        threading.Thread(
+            target=_watch_resource,
+            args=(apps_api.list_namespaced_deployment, on_deployment_events, done, deadline, interval),
+            kwargs={
+                "resource_version": deployment_list.metadata.resource_version,
+                "namespace": namespace,
+                "field_selector": deployment_selector,
+            },
+            daemon=True,
+        ),
+    ]
+    for watcher in watchers:
+        watcher.start()
+
+    while True:
+        now = time.monotonic()
+        if now - start_time >= timeout:
+            logger.warning(f"⚠️ Timeout reached ({timeout}s); only {available} replicas available.")
+            break
+        elapsed = int(now - start_time)
 
-        total_nodes = len(all_nodes)
-        ready_nodes = len(node_ready_time)
+        with lock:
+            total_nodes = len(all_nodes)
+            ready_nodes = len(node_ready_time)
 
         logger.info(f"t+{elapsed}s: {available}/{target_replicas} replicas | {total_nodes} nodes | {ready_nodes} ready")
 
@@ -73,67 +213,143 @@ def track_scaling_telemetry(
             logger.info("✅ Deployment scaled successfully.")
             break
 
-        time.sleep(interval)
-    else:
-        logger.warning(f"⚠️ Timeout reached ({timeout}s); only {available} replicas available.")
+        # Wakes early once the deployment watch reports the target; the next tick records the final sample
+        done.wait(interval)
+
+    # Taken before stopping the watchers, so their shutdown is not part of the measured time
+    final_elapsed = int(time.monotonic() - start_time)
+
+    # Stop the watch threads. Callbacks ignore events once `done` is set, so a watcher
+    # still finishing its round can't change the state summarised below; the bounded
+    # join keeps that round from delaying the return.
+    done.set()
+    join_deadline = time.monotonic() + WATCHER_JOIN_TIMEOUT
+    for watcher in watchers:
+        watcher.join(timeout=max(0, join_deadline - time.monotonic()))
 
     # Final summary data
-    final_elapsed = int(time.time() - start_time)
     final_available = time_series[-1][1]
     final_nodes = time_series[-1][2]
 
-    # Compute durations
-    node_ready_durations = {
-        node: node_ready_time[node] - node_first_seen[node]
-        for node in node_ready_time
-    }
-
-    new_node_names = set(node_ready_durations.keys()) - initial_nodes
-    new_node_count = len(new_node_names)
-    if new_node_count:
-        durations = [node_ready_durations[n] for n in new_node_names]
-        min_t = min(durations)
-        max_t = max(durations)
-        avg_t = round(mean(durations), 2)
-    else:
-        min_t = max_t = avg_t = 0
+    # Compute durations, CSV rows and new-node durations in a single pass
+    node_ready_durations = {}
+    node_rows = []
+    new_node_count = 0
+    total_t = 0
+    min_t = max_t = None
+    with lock:
+        for node, ready_at in node_ready_time.items():
+            first_seen = node_first_seen[node]
+            time_to_ready = ready_at - first_seen
+            node_ready_durations[node] = time_to_ready
+            node_rows.append((node, first_seen, ready_at, time_to_ready))
+            if node not in initial_nodes:
+                new_node_count += 1
+                total_t += time_to_ready
+                if min_t is None or time_to_ready < min_t:
+                    min_t = time_to_ready
+                if max_t is None or time_to_ready > max_t:
+                    max_t = time_to_ready
+
+    avg_t = round(total_t / new_node_count, 2) if new_node_count else 0
+    min_t = min_t or 0
+    max_t = max_t or 0
 
     # 📄 CSV Export
     if write_csv:
-        with open("scale_time_series.csv", "w") as f:
-            f.write("time_sec,available_replicas,total_nodes,ready_nodes\n")
-            for t, a, n, r in time_series:
-                f.write(f"{t},{a},{n},{r}\n")
-
-        with open("node_ready_times.csv", "w") as f:
-            f.write("node_name,first_seen_sec,ready_at_sec,time_to_ready_sec\n")
-            for node in node_ready_time:
-                first_seen = node_first_seen[node]
-                ready_at = node_ready_time[node]
-                time_to_ready = ready_at - first_seen
-                f.write(f"{node},{first_seen},{ready_at},{time_to_ready}\n")
+        with open("scale_time_series.csv", "w", newline="", buffering=1 << 16) as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["time_sec", "available_replicas", "total_nodes", "ready_nodes"])
+            writer.writerows(time_series)
+
+        with open("node_ready_times.csv", "w", newline="", buffering=1 << 16) as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["node_name", "first_seen_sec", "ready_at_sec", "time_to_ready_sec"])
+            writer.writerows(node_rows)
 
     # 🧾 Tabular Summary
-    table = Table(title="📈 GKE Scaling Summary", style="bold white")
+    if summary:
+        from rich.console import Console
+        from rich.table import Table
 
-    table.add_column("Metric", style="cyan", no_wrap=True)
-    table.add_column("Value", style="green")
+        table = Table(title="📈 GKE Scaling Summary", style="bold white")
 
-    table.add_row("Target Replicas", str(target_replicas))
-    table.add_row("Achieved Replicas", str(final_available))
-    table.add_row("Total Time (s)", str(final_elapsed))
-    table.add_row("Initial Node Count", str(len(initial_nodes)))
-    table.add_row("Final Node Count", str(final_nodes))
-    table.add_row("New Nodes Added", str(new_node_count))
-    table.add_row("Min Node Ready Time (s)", str(min_t))
-    table.add_row("Max Node Ready Time (s)", str(max_t))
-    table.add_row("Avg Node Ready Time (s)", str(avg_t))
+        table.add_column("Metric", style="cyan", no_wrap=True)
+        table.add_column("Value", style="green")
 
-    console.print(table)
+        table.add_row("Target Replicas", str(target_replicas))
+        table.add_row("Achieved Replicas", str(final_available))
+        table.add_row("Total Time (s)", str(final_elapsed))
+        table.add_row("Initial Node Count", str(len(initial_nodes)))
+        table.add_row("Final Node Count", str(final_nodes))
+        table.add_row("New Nodes Added", str(new_node_count))
+        table.add_row("Min Node Ready Time (s)", str(min_t))
+        table.add_row("Max Node Ready Time (s)", str(max_t))
+        table.add_row("Avg Node Ready Time (s)", str(avg_t))
+
+        Console().print(table)
 
     return time_series, node_ready_durations
 
 
+def _get_resolver():
+    """
+    Return the shared DNS resolver, creating it on first use.
+    """
+    global _RESOLVER
+    if _RESOLVER is None:
+        import dns.resolver
+
+        _RESOLVER = dns.resolver.Resolver()
+    return _RESOLVER
+
+
+def _get_async_resolver():
+    """
+    Return the shared asyncio DNS resolver, creating it on first use.
+    """
+    global _ASYNC_RESOLVER
+    if _ASYNC_RESOLVER is None:
+        import dns.asyncresolver
+
+        _ASYNC_RESOLVER = dns.asyncresolver.Resolver()
+    return _ASYNC_RESOLVER
+
+
+def _dns_success(host: str, ip_address: str, nameserver: str, duration_ms: float, expect_nodelocal: bool) -> Dict[str, Any]:
+    """
+    Log a successful resolution and return its telemetry dict.
+    """
+    logger.info(f"✅ Resolved {host} to {ip_address} via {nameserver} in {duration_ms} ms")
+
+    if expect_nodelocal and not nameserver.startswith("169.254"):
+        logger.warning(f"⚠️ Resolution for {host} did not use NodeLocal DNS (used: {nameserver})")
+
+    return {
+        "host": host,
+        "ip": ip_address,
+        "nameserver": nameserver,
+        "duration_ms": duration_ms,
+        "success": True,
+        "error": "",
+    }
+
+
+def _dns_failure(host: str, error: Exception) -> Dict[str, Any]:
+    """
+    Log a failed resolution and return its telemetry dict.
+    """
+    logger.error(f"❌ DNS resolution failed for {host}: {error}")
+    return {
+        "host": host,
+        "ip": None,
+        "nameserver": None,
+        "duration_ms": None,
+        "success": False,
+        "error": str(error),
+    }
+
+
 def track_dns_resolution_telemetry(
     host: str,
     timeout: float = 5.0,
@@ -146,11 +362,12 @@ def track_dns_resolution_telemetry(
     - DNS server used
     - Whether NodeLocal DNS was used (169.254.20.10)
 
-    Returns a dict containing all metrics.
+    Returns a dict containing all metrics. Kept for single lookups; use
+    resolve_many() when resolving more than one host.
     """
 
     try:
-        resolver = dns.resolver.Resolver()
+        resolver = _get_resolver()
         resolver.lifetime = timeout
         resolver.timeout = timeout
 
@@ -158,34 +375,43 @@ def track_dns_resolution_telemetry(
         answer = resolver.resolve(host)
         end = time.time()
 
-        ip_address = answer[0].to_text()
-        nameserver = resolver.nameservers[0]
         duration_ms = round((end - start) * 1000, 2)
+        return _dns_success(host, answer[0].to_text(), resolver.nameservers[0], duration_ms, expect_nodelocal)
 
-        logger.info(f"✅ Resolved {host} to {ip_address} via {nameserver} in {duration_ms} ms")
+    except Exception as e:
+        return _dns_failure(host, e)
 
-        if expect_nodelocal and not nameserver.startswith("169.254"):
-            logger.warning(f"⚠️ Resolution for {host} did not use NodeLocal DNS (used: {nameserver})")
 
-        return {
-            "host": host,
-            "ip": ip_address,
-            "nameserver": nameserver,
-            "duration_ms": duration_ms,
-            "success": True,
-            "error": "",
-        }
+async def resolve_many(
+    hosts: List[str],
+    timeout: float = 5.0,
+    expect_nodelocal: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Resolve several FQDNs concurrently and return their telemetry dicts in input order.
 
+    Lookups run on dnspython's asyncio resolver under asyncio.gather, so total wall
+    time is bounded by the slowest lookup rather than their sum.
+    """
+    try:
+        resolver = _get_async_resolver()
+        nameserver = resolver.nameservers[0]
     except Exception as e:
-        logger.error(f"❌ DNS resolution failed for {host}: {e}")
-        return {
-            "host": host,
-            "ip": None,
-            "nameserver": None,
-            "duration_ms": None,
-            "success": False,
-            "error": str(e),
-        }
+        # No usable resolver (e.g. missing resolv.conf): every host fails, as in the single-lookup path
+        return [_dns_failure(host, e) for host in hosts]
+
+    async def resolve_one(host):
+        try:
+            start = time.monotonic()
+            # lifetime is per query, so overlapping calls with different timeouts don't share state
+            answer = await resolver.resolve(host, lifetime=timeout)
+            duration_ms = round((time.monotonic() - start) * 1000, 2)
+            return _dns_success(host, answer[0].to_text(), nameserver, duration_ms, expect_nodelocal)
+        except Exception as e:
+            return _dns_failure(host, e)
+
+    return list(await asyncio.gather(*(resolve_one(host) for host in hosts)))
+
 
 def format_dns_telemetry_table(metrics: list[dict]) -> str:
     """
@@ -196,10 +422,9 @@ def format_dns_telemetry_table(metrics: list[dict]) -> str:
 
     header = "| Host | IP Address | Resolver | Time (ms) | Success | Error |\n"
     divider = "|------|------------|----------|-----------|---------|-------|\n"
-    rows = []
 
-    for m in metrics:
-        rows.append(
+    def format_row(m):
+        return (
             f"| {m['host']} "
             f"| {m.get('ip') or '-'} "
             f"| {m.get('nameserver') or '-'} "
@@ -208,18 +433,16 @@ def format_dns_telemetry_table(metrics: list[dict]) -> str:
             f"| {m.get('error', '')[:50]} |"
         )
 
-    return header + divider + "\n".join(rows)
-
-from rich.table import Table
-from rich.console import Console
-from typing import List, Dict, Any
-
-console = Console()
+    return "".join((header, divider, "\n".join(map(format_row, metrics))))
 
 def print_dns_telemetry_rich(metrics: List[Dict[str, Any]]):
     """
     Print DNS resolution telemetry using rich table format.
     """
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
     if not metrics:
         console.print("[yellow]⚠️ No DNS telemetry data available.[/yellow]")
         return
@@ -1,13 +1,39 @@
+import functools
 import tomli
 import logging
 from src.utils.logging_util import get_logger
 
+
+@functools.lru_cache(maxsize=None)
+def read_toml(config_file):
+    """
+    Parse a TOML file, once per path per process.
+
+    Does no logging of its own, so logging_util can read its settings through
+    it while loggers are being set up. Treat the returned dict as read-only.
+
+    Args:
+        config_file (str): Path to the TOML file.
+
+    Returns:
+        dict: Parsed TOML data.
+    """
+    with open(config_file, "rb") as file:
+        return tomli.load(file)
+
+
+# Created after read_toml, which get_logger reaches (via logging_util) on first use
 logger = get_logger(__name__)
 
+
+@functools.lru_cache(maxsize=None)
 def load_config(config_file="config/settings.toml"):
     """
     Load configuration from a TOML file.
 
+    Results are cached per path, so repeated calls (one per test module) parse
+    the file only once. Treat the returned dict as read-only.
+
     Args:
         config_file (str): Path to the configuration file.
 
@@ -16,8 +42,7 @@ def load_config(config_file="config/settings.toml"):
     """
     logger.info(f"Loading configuration from {config_file}...")
     try:
-        with open(config_file, "rb") as file:
-            config = tomli.load(file)
+        config = read_toml(config_file)
         logger.info("Configuration loaded successfully.")
         return config
     except Exception as e:
@@ -1,8 +1,8 @@
 import os
-import tomli
 from kubernetes import client, config
 from kubernetes.client.api_client import ApiClient
 from urllib3 import ProxyManager
+from src.utils.config_util import load_config
 from src.utils.logging_util import get_logger
 
 logger = get_logger(__name__)
@@ -21,6 +21,7 @@ class KubernetesClient:
         """
         self.config = self._load_config(config_file)
         self.api_clients = {}  # Cache for API clients
+        self.api_client = None  # Shared ApiClient backing every API client
         self.proxy_manager = None  # ProxyManager instance
         self._initialize_client()
 
@@ -34,18 +35,8 @@ class KubernetesClient:
         Returns:
             dict: Parsed configuration data.
         """
-        logger.info(f"Loading configuration from {config_file}...")
-        try:
-            with open(config_file, "rb") as file:
-                config_data = tomli.load(file)
-                logger.info("Configuration loaded successfully.")
-                return config_data
-        except FileNotFoundError:
-            logger.error(f"Configuration file not found: {config_file}.")
-            raise
-        except Exception as e:
-            logger.exception(f"Failed to load configuration: {e}")
-            raise
+        # Shares the cached parse with every other load_config() caller
+        return load_config(config_file)
 
     def _initialize_client(self):
         """
@@ -69,6 +60,12 @@ class KubernetesClient:
                 logger.error(f"Invalid config_mode: {config_mode}")
                 raise ValueError(f"Invalid config_mode: {config_mode}. Use 'local' or 'in-cluster'.")
 
+            # One ApiClient (and urllib3 pool) is shared by all API clients so connections are reused
+            configuration = client.Configuration.get_default_copy()
+            configuration.connection_pool_maxsize = self.config.get("k8s", {}).get("connection_pool_maxsize", 32)
+            self.api_client = ApiClient(configuration=configuration)
+            logger.debug(f"Connection pool size set to: {configuration.connection_pool_maxsize}")
+
             logger.info("Kubernetes configuration initialized successfully.")
         except Exception as e:
             logger.exception(f"Failed to initialize Kubernetes client: {e}")
@@ -127,9 +124,9 @@ class KubernetesClient:
         if api_type not in self.api_clients:
             logger.info(f"Initializing API client for: {api_type}")
             if api_type == "AppsV1Api":
-                self.api_clients[api_type] = client.AppsV1Api()
+                self.api_clients[api_type] = client.AppsV1Api(self.api_client)
             elif api_type == "CoreV1Api":
-                self.api_clients[api_type] = client.CoreV1Api()
+                self.api_clients[api_type] = client.CoreV1Api(self.api_client)
             else:
                 logger.error(f"Unsupported API client type: {api_type}")
                 raise ValueError(f"Unsupported API client type: {api_type}")
@@ -1,5 +1,4 @@
 import logging
-import tomli  # For parsing TOML configuration files
 
 
 def load_logging_config(config_file="config/settings.toml"):
@@ -13,8 +12,10 @@ def load_logging_config(config_file="config/settings.toml"):
         str: The log level specified in the configuration file.
     """
     try:
-        with open(config_file, "rb") as file:
-            config = tomli.load(file)
+        # Imported here: config_util imports this module for its logger
+        from src.utils.config_util import read_toml
+
+        config = read_toml(config_file)
         return config.get("logging", {}).get("level", "INFO")  # Default to INFO
     except Exception as e:
         print(f"Failed to load logging configuration: {e}")
@@ -1,35 +1,96 @@
+import functools
+import json
 import pytest
+from collections import Counter
+from datetime import datetime, timezone
 import time
 import logging
 from src.utils.k8s_client import KubernetesClient
-from datetime import datetime
 
-# Configure global logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+class SummaryFormatter(logging.Formatter):
+    """
+    Console formatter that renders the structured pytest-summary record as a short
+    human-readable banner; every other record uses the regular format.
+    """
+
+    def format(self, record):
+        if getattr(record, "summary_type", None) != "pytest-summary":
+            return super().format(record)
+        summary = json.loads(record.getMessage())
+        banner = "\n".join((
+            "📄 Pytest Execution Summary",
+            f"🕒 Duration: {summary['duration_s']:.2f} seconds",
+            f"✅ Passed: {summary['passed']}",
+            f"❌ Failed: {summary['failed']}",
+            f"⚠️ Skipped: {summary['skipped']}",
+            f"📦 Total: {summary['total']}",
+        ))
+        # Format a copy carrying the banner, so the configured fmt and any exc_info/stack_info still apply
+        banner_record = logging.makeLogRecord({**record.__dict__, "msg": banner, "args": (), "message": banner})
+        return super().format(banner_record)
+
+
+# Configure global logging, unless a root handler is already installed
+if not logging.getLogger().handlers:
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(SummaryFormatter("%(asctime)s - %(levelname)s - %(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[console_handler])
 logger = logging.getLogger(__name__)
 
+# Track test start time and outcomes
+test_results = {
+    "start_time": None,  # time.monotonic() at session start, for the duration
+    "start_ns": None,  # time.time_ns() wall clock at session start, rendered only when the summary is emitted
+    "counts": Counter(),  # outcome -> number of tests
+    "records": [],  # (outcome, nodeid) for failed/skipped tests; passed tests are only counted
+}
+
+# DNS telemetry dicts (see src.utils.Sample.track_dns_resolution_telemetry) appended by tests during the session
+dns_metrics_global = []
+
+# Summary records carry structured fields for log routing; the adapter is built once and reused
+summary_logger = logging.LoggerAdapter(logger, {"summary_type": "pytest-summary", "component": "test-telemetry"})
+
+
+def pytest_configure(config):
+    """
+    Register the custom markers used by the scaling suites.
+
+    The scaling modules also carry xdist_group("scale-test"): they all resize the
+    same Deployment, so `--dist loadgroup` keeps them on one worker.
+    """
+    config.addinivalue_line("markers", "slow: long-running waits on cluster scaling (minutes)")
+    config.addinivalue_line("markers", "k8s: requires access to a Kubernetes cluster")
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_protocol(item):
     """
     Hook to log the start, end, and duration of each test.
+    Timing is skipped entirely when INFO logging is disabled.
     """
-    logger.info(f"Starting test: {item.name}")
-    start_time = time.time()
+    enabled = logger.isEnabledFor(logging.INFO)
+    if enabled:
+        logger.info("Starting test: %s", item.name)
+        start_time = time.perf_counter()
     yield  # Execute the test
-    end_time = time.time()
-    duration = end_time - start_time
-    logger.info(f"Finished test: {item.name} in {duration:.3f} seconds.")
+    if enabled:
+        duration = time.perf_counter() - start_time
+        logger.info("Finished test: %s in %.3f seconds.", item.name, duration)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def k8s_client():
     """
     Fixture to provide Kubernetes API clients dynamically.
+    The underlying KubernetesClient is built once per test session.
     """
     config_file = "config/settings.toml"
     logger.info(f"Initializing Kubernetes client with config file: {config_file}")
     k8s = KubernetesClient(config_file=config_file)
 
+    @functools.lru_cache(maxsize=None)
     def get_client(api_type):
         """
         Retrieve the specified Kubernetes API client.
@@ -45,80 +106,72 @@ def k8s_client():
 
     return get_client
 
-import pytest
-import logging
-from datetime import datetime
 
-# Track test start time and outcomes
-test_results = {
-    "start_time": None,
-    "end_time": None,
-    "passed": [],
-    "failed": [],
-    "skipped": [],
-    "total": 0
-}
+@pytest.fixture(scope="session")
+def apps_v1(k8s_client):
+    """
+    Fixture providing the session's AppsV1Api client.
+    """
+    return k8s_client("AppsV1Api")
+
+
+@pytest.fixture(scope="session")
+def core_v1(k8s_client):
+    """
+    Fixture providing the session's CoreV1Api client.
+    """
+    return k8s_client("CoreV1Api")
+
 
 @pytest.hookimpl(tryfirst=True)
 def pytest_sessionstart(session):
-    test_results["start_time"] = datetime.utcnow()
+    test_results["start_time"] = time.monotonic()
+    test_results["start_ns"] = time.time_ns()
 
-@pytest.hookimpl(hookwrapper=True)
-def pytest_runtest_makereport(item, call):
-    outcome = yield
-    result = outcome.get_result()
+def pytest_runtest_logreport(report):
+    # Runs on the xdist controller as worker reports arrive, so counts cover every worker.
+    # Setup/teardown reports are not counted.
+    if report.when != "call":
+        return
 
-    if result.when == "call":
-        nodeid = item.nodeid
-        test_results["total"] += 1
-
-        if result.outcome == "passed":
-            test_results["passed"].append(nodeid)
-        elif result.outcome == "failed":
-            test_results["failed"].append(nodeid)
-        elif result.outcome == "skipped":
-            test_results["skipped"].append(nodeid)
+    test_results["counts"][report.outcome] += 1
+    if report.outcome != "passed":
+        test_results["records"].append((report.outcome, report.nodeid))
 
 
 @pytest.hookimpl(trylast=True)
 def pytest_sessionfinish(session, exitstatus):
-    test_results["end_time"] = datetime.utcnow()
-    duration = test_results["end_time"] - test_results["start_time"]
-
-    # Collect log lines
-    lines = []
-    lines.append("📄 Pytest Execution Summary")
-    lines.append(f"🕒 Duration: {duration.total_seconds():.2f} seconds")
-    lines.append(f"✅ Passed: {len(test_results['passed'])}")
-    lines.append(f"❌ Failed: {len(test_results['failed'])}")
-    lines.append(f"⚠️ Skipped: {len(test_results['skipped'])}")
-    lines.append(f"📦 Total: {test_results['total']}")
-
-    if test_results["passed"]:
-        lines.append("\n✅ Passed Tests:")
-        lines.extend([f"  - {t}" for t in test_results["passed"]])
-    if test_results["failed"]:
-        lines.append("\n❌ Failed Tests:")
-        lines.extend([f"  - {t}" for t in test_results["failed"]])
-    if test_results["skipped"]:
-        lines.append("\n⚠️ Skipped Tests:")
-        lines.extend([f"  - {t}" for t in test_results["skipped"]])
-
-    # DNS Telemetry Summary
-    if dns_metrics_global:
-        lines.append("\n🌐 DNS Resolution Summary")
-        for m in dns_metrics_global:
-            lines.append(
-                f"  {m.get('host', '-')}: {m.get('ip_address', '-')} "
-                f"via {m.get('nameserver', '-')} in {m.get('duration_ms', '-')} ms"
-            )
-
-    # Join into single string for structured log
-    summary_log = "\n".join(lines)
-    logger.bind(summary_type="pytest-summary", component="test-telemetry").info(summary_log)
+    # xdist workers report outcomes to the controller, which emits the one summary
+    if hasattr(session.config, "workerinput"):
+        return
+
+    duration = time.monotonic() - test_results["start_time"]
+    counts = test_results["counts"]
+    failed = [nodeid for outcome, nodeid in test_results["records"] if outcome == "failed"]
+    skipped = [nodeid for outcome, nodeid in test_results["records"] if outcome == "skipped"]
+    total = sum(counts.values())
+
+    # Full summary as one JSON record, so log pipelines can filter on its fields;
+    # SummaryFormatter prints the human-readable banner from it on the console
+    payload = {
+        "total": total,
+        "passed": counts["passed"],
+        "failed": counts["failed"],
+        "skipped": counts["skipped"],
+        "started_at": datetime.fromtimestamp(test_results["start_ns"] / 1e9, timezone.utc).isoformat(),
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "duration_s": round(duration, 2),
+        "failed_tests": failed,
+        "skipped_tests": skipped,
+        "dns": dns_metrics_global,
+    }
+    summary_logger.info(json.dumps(payload, separators=(",", ":"), ensure_ascii=False))
 
     # Also print rich table locally (optional)
     if dns_metrics_global:
+        from rich.console import Console
+        from rich.table import Table
+
         table = Table(title="DNS Resolution Telemetry", show_lines=True, expand=True)
         table.add_column("Host", style="cyan", no_wrap=False)
         table.add_column("IP Address", style="green", min_width=15, overflow="fold")
@@ -129,11 +182,11 @@ def pytest_sessionfinish(session, exitstatus):
 
         for m in dns_metrics_global:
             table.add_row(
-                m.get("host", "-"),
-                m.get("ip_address", "-"),
-                m.get("nameserver", "-"),
-                f"{m.get('duration_ms', '-')}",
-                "[green]✅[/green]" if m.get("success") else "[red]❌[/red]",
-                m.get("error", "") or "-"
+                m["host"],
+                m["ip"] or "-",
+                m["nameserver"] or "-",
+                f"{m['duration_ms'] or '-'}",
+                "[green]✅[/green]" if m["success"] else "[red]❌[/red]",
+                m["error"] or "-"
             )
-        console.print(table)
+        Console().print(table)
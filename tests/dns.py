@@ -1,53 +1,84 @@
+import time
+import uuid
 import pytest
 from pytest_bdd import scenarios, given, when, then
 from kubernetes import client, config, stream
-import tomli  # Or use tomllib in Python 3.11+
+from src.utils.config_util import load_config
 
 scenarios('dns_connectivity.feature')
 
 CONFIG_PATH = "config.toml"
 NAMESPACE = "platform-scale-test"
 DEPLOYMENT_NAME = "scale-test"
+PING_TIMEOUT = 30  # seconds
+PING_MARKER_PREFIX = "__PING__"
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def k8s_api():
     config.load_kube_config()
     return client.CoreV1Api()
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def target_ip():
-    with open(CONFIG_PATH, "rb") as f:
-        config_data = tomli.load(f)
-    return config_data["dns"]["target_ip"]
+    return load_config(CONFIG_PATH)["dns"]["target_ip"]
+
+@pytest.fixture(scope="session")
+def running_pod(k8s_api):
+    # Let the API server filter on phase and return a single pod
+    pods = k8s_api.list_namespaced_pod(
+        namespace=NAMESPACE,
+        label_selector="app=scale-test",
+        field_selector="status.phase=Running",
+        limit=1,
+    )
+    if not pods.items:
+        pytest.fail("No running pod found in deployment")
+    return pods.items[0].metadata.name
+
+@pytest.fixture(scope="session")
+def pod_shell(k8s_api, running_pod):
+    """
+    One long-lived shell in the pod; every ping reuses its exec websocket
+    instead of paying a TLS + WebSocket handshake per command.
+    """
+    ws = stream.stream(
+        k8s_api.connect_get_namespaced_pod_exec,
+        name=running_pod,
+        namespace=NAMESPACE,
+        command=["/bin/sh"],
+        stderr=True, stdin=True, stdout=True, tty=False,
+        _preload_content=False,
+    )
+    yield ws
+    ws.close()
 
 @given('a running deployment named "scale-test" in namespace "platform-scale-test"')
 def ensure_deployment_exists():
     pass  # You can validate via AppsV1Api if needed
 
 @given("at least one pod from the deployment is running")
-def get_running_pod(k8s_api):
-    pods = k8s_api.list_namespaced_pod(
-        namespace=NAMESPACE, label_selector="app=scale-test"
-    )
-    for pod in pods.items:
-        if pod.status.phase == "Running":
-            return pod.metadata.name
-    pytest.fail("No running pod found in deployment")
-
-@when("I ping the configured DNS IP from that pod")
-def run_ping(k8s_api, get_running_pod, target_ip):
-    command = ["ping", "-c", "3", target_ip]
+def get_running_pod(running_pod):
+    return running_pod
+
+@when("I ping the configured DNS IP from that pod", target_fixture="run_ping")
+def run_ping(pod_shell, target_ip):
+    # Per-call markers delimit this ping's output on the shared shell, so leftovers from
+    # an earlier ping that timed out can't be mistaken for this one's result
+    marker = f"{PING_MARKER_PREFIX}{uuid.uuid4().hex}"
+    start_marker, done_marker = f"{marker}_START", f"{marker}_DONE"
+    pod_shell.write_stdin(f"echo {start_marker}; ping -c 3 {target_ip}; echo {done_marker}\n")
+    output = ""
+    deadline = time.monotonic() + PING_TIMEOUT
     try:
-        response = stream.stream(
-            k8s_api.connect_get_namespaced_pod_exec,
-            name=get_running_pod,
-            namespace=NAMESPACE,
-            command=command,
-            stderr=True, stdin=False, stdout=True, tty=False,
-        )
-        return response
+        while done_marker not in output and pod_shell.is_open() and time.monotonic() < deadline:
+            pod_shell.update(timeout=1)
+            # timeout=0 returns at once when nothing reached stdout (e.g. only stderr arrived)
+            output += pod_shell.read_stdout(timeout=0)
     except Exception as e:
         pytest.fail(f"Ping failed: {e}")
+    if done_marker not in output:
+        pytest.fail(f"Ping did not complete within {PING_TIMEOUT} seconds")
+    return output.split(done_marker, 1)[0].split(start_marker, 1)[-1]
 
 @then("the ping should succeed with 0% packet loss")
 def verify_ping_success(run_ping):
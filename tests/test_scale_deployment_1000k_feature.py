@@ -5,6 +5,7 @@ import time
 from src.utils.config_util import load_config
 
 logger = get_logger(__name__)
+pytestmark = [pytest.mark.k8s, pytest.mark.slow, pytest.mark.xdist_group("scale-test")]
 # Load configuration once at module level
 CONFIG = load_config()
 # Link the Gherkin feature file
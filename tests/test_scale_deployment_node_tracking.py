@@ -1,15 +1,62 @@
 import time
+import orjson
+import pytest
+from kubernetes import watch
+from kubernetes.watch.watch import iter_resp_lines
+from kubernetes.client.rest import ApiException
 from pytest_bdd import given, when, then, scenarios
 from src.utils.logging_util import get_logger
 from src.utils.config_util import load_config
 
 logger = get_logger(__name__)
+pytestmark = [pytest.mark.k8s, pytest.mark.slow, pytest.mark.xdist_group("scale-test")]
 # Load configuration once at module level
 CONFIG = load_config()
+# Session-constant settings, bound once so the steps don't re-index CONFIG
+NAMESPACE = CONFIG["k8s"]["namespace"]
+DEPLOYMENT = CONFIG["k8s"]["deployment_name"]
+REPLICAS = CONFIG["k8s"].get("replicas", 1000)
+TIMEOUT = CONFIG["k8s"].get("scale_timeout", 240)  # seconds
 # Link the Gherkin feature file
 scenarios("../features/scale_deployment_node_tracking.feature")
 
 
+def _is_ready(conditions):
+    """Return True if the node conditions report Ready=True."""
+    # Plain loop over the handful of conditions; returns at the Ready entry without a generator frame
+    for condition in conditions or ():
+        if condition.type == "Ready":
+            return condition.status == "True"
+    return False
+
+
+def _list_node_readiness(core_v1, page_size=500):
+    """
+    List all nodes page by page and return (node names, Ready node names, resourceVersion).
+
+    Pages are decoded straight from the raw JSON response, skipping the client's
+    model deserialization, which dominates the cost of large node lists.
+    """
+    nodes = set()
+    ready = set()
+    continue_token = None
+    while True:
+        response = core_v1.list_node(limit=page_size, _continue=continue_token, _preload_content=False)
+        page = orjson.loads(response.data)
+        for item in page["items"]:
+            name = item["metadata"]["name"]
+            nodes.add(name)
+            for condition in item.get("status", {}).get("conditions") or ():
+                if condition["type"] == "Ready":
+                    if condition["status"] == "True":
+                        ready.add(name)
+                    break
+
+        continue_token = page["metadata"].get("continue")
+        if not continue_token:
+            return nodes, ready, page["metadata"]["resourceVersion"]
+
+
 @given("a Kubernetes cluster is running")
 def verify_cluster_running(k8s_client):
     """Verify that the Kubernetes cluster is accessible."""
@@ -19,88 +66,127 @@ def verify_cluster_running(k8s_client):
 
 
 @given('a deployment named "scale-test" exists in the "scale-test" namespace')
-def verify_deployment_exists(k8s_client):
+def verify_deployment_exists(apps_v1):
     """Ensure the deployment exists."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
-
-    # Retrieve AppsV1Api client
-    apps_api = k8s_client("AppsV1Api")
-    logger.info(f"Checking if deployment '{deployment_name}' exists in namespace '{namespace}'...")
-    response = apps_api.read_namespaced_deployment(name=deployment_name, namespace=namespace)
-    assert response is not None, f"Deployment '{deployment_name}' does not exist in namespace '{namespace}'."
-    logger.info(f"Deployment '{deployment_name}' exists.")
+    logger.info(f"Checking if deployment '{DEPLOYMENT}' exists in namespace '{NAMESPACE}'...")
+    response = apps_v1.read_namespaced_deployment(name=DEPLOYMENT, namespace=NAMESPACE)
+    assert response is not None, f"Deployment '{DEPLOYMENT}' does not exist in namespace '{NAMESPACE}'."
+    logger.info(f"Deployment '{DEPLOYMENT}' exists.")
 
 
 @when('I scale "scale-test" to 1000 replicas')
-def scale_deployment(k8s_client):
+def scale_deployment(apps_v1):
     """Scale the deployment to 1000 replicas."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
-    replicas = 1000
-
-    # Retrieve AppsV1Api client
-    apps_api = k8s_client("AppsV1Api")
-    logger.info(f"Scaling deployment '{deployment_name}' in namespace '{namespace}' to {replicas} replicas.")
-    body = {"spec": {"replicas": replicas}}
-    apps_api.patch_namespaced_deployment_scale(name=deployment_name, namespace=namespace, body=body)
+    logger.info(f"Scaling deployment '{DEPLOYMENT}' in namespace '{NAMESPACE}' to {REPLICAS} replicas.")
+    body = {"spec": {"replicas": REPLICAS}}
+    apps_v1.patch_namespaced_deployment_scale(name=DEPLOYMENT, namespace=NAMESPACE, body=body)
 
 
 @then("new nodes should become ready within 240 seconds")
-def verify_nodes_ready(k8s_client):
+def verify_nodes_ready(core_v1):
     """Measure the time taken for all nodes to become ready."""
-    core_api = k8s_client("CoreV1Api")
     node_ready_start_time = time.time()
-    timeout = 240  # seconds
-    interval = 10  # seconds
 
     logger.info("Waiting for all new nodes to become ready...")
-    while time.time() - node_ready_start_time < timeout:
-        nodes = core_api.list_node().items
-        ready_nodes = [
-            node.metadata.name
-            for node in nodes
-            if any(condition.type == "Ready" and condition.status == "True" for condition in node.status.conditions)
-        ]
-        logger.debug(f"Ready nodes: {ready_nodes}")
-
-        # Check if all nodes are ready
-        if len(ready_nodes) == len(nodes):
+    # Node names and the subset currently Ready, updated per event so no tick rescans every node
+    nodes = set()
+    ready = set()
+    resource_version = None
+    while True:
+        # List once for the full node set, then follow changes from that resourceVersion
+        if resource_version is None:
+            nodes, ready, resource_version = _list_node_readiness(core_v1)
+
+        if nodes and len(ready) == len(nodes):
             total_node_ready_time = time.time() - node_ready_start_time
             logger.info(f"All nodes became ready in {total_node_ready_time:.2f} seconds.")
             return
-        time.sleep(interval)
+
+        remaining = int(TIMEOUT - (time.time() - node_ready_start_time))
+        if remaining <= 0:
+            break
+
+        w = watch.Watch()
+        try:
+            for event in w.stream(core_v1.list_node, resource_version=resource_version, timeout_seconds=remaining):
+                node = event["object"]
+                if event["type"] == "DELETED":
+                    nodes.discard(node.metadata.name)
+                    ready.discard(node.metadata.name)
+                elif event["type"] in ("ADDED", "MODIFIED"):
+                    name = node.metadata.name
+                    nodes.add(name)
+                    if _is_ready(node.status.conditions):
+                        ready.add(name)
+                    else:
+                        ready.discard(name)
+                resource_version = w.resource_version
+                logger.debug("Ready nodes: %d/%d", len(ready), len(nodes))
+
+                if len(ready) == len(nodes):
+                    w.stop()
+                    break
+        except ApiException as e:
+            if e.status != 410:
+                raise
+            logger.debug("Node watch expired (410 Gone); relisting.")
+            resource_version = None
 
     raise RuntimeError("Not all nodes became ready within the timeout.")
 
 
 @then("all replicas of the deployment should be running and available within 240 seconds")
-def verify_pods_ready(k8s_client):
+def verify_pods_ready(apps_v1):
     """Measure the time taken for all replicas to be scheduled and available."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
-    apps_api = k8s_client("AppsV1Api")
-
     pod_schedule_start_time = time.time()
-    timeout = 240  # seconds
-    interval = 10  # seconds
-
-    logger.info(f"Waiting for deployment '{deployment_name}' to have all replicas running and available...")
-    while time.time() - pod_schedule_start_time < timeout:
-        response = apps_api.read_namespaced_deployment(name=deployment_name, namespace=namespace)
-        pods_ready = (
-            response.status.replicas == 1000
-            and response.status.available_replicas == 1000
-        )
-        logger.debug(f"Deployment status: {response.status.replicas} replicas, {response.status.available_replicas} available replicas.")
 
-        if pods_ready:
-            total_pod_ready_time = time.time() - pod_schedule_start_time
-            logger.info(f"All replicas became ready in {total_pod_ready_time:.2f} seconds.")
-            return
-        time.sleep(interval)
-
-    raise RuntimeError(f"Deployment '{deployment_name}' did not scale to 1000 replicas within the timeout.")
+    logger.info(f"Waiting for deployment '{DEPLOYMENT}' to have all replicas running and available...")
+    while True:
+        remaining = int(TIMEOUT - (time.time() - pod_schedule_start_time))
+        if remaining <= 0:
+            break
+
+        # A watch without resourceVersion starts with the Deployment's current state.
+        # Events are read off the raw stream and decoded with orjson, skipping the
+        # V1Deployment model the watch helper would build for every update.
+        response = apps_v1.list_namespaced_deployment(
+            namespace=NAMESPACE,
+            field_selector=f"metadata.name={DEPLOYMENT}",
+            watch=True,
+            timeout_seconds=remaining,
+            _preload_content=False,
+        )
+        try:
+            for line in iter_resp_lines(response):
+                event = orjson.loads(line)
+                if event["type"] == "ERROR":
+                    error = event["object"]
+                    if error.get("code") != 410:
+                        raise ApiException(status=error.get("code"), reason=error.get("message"))
+                    logger.debug("Deployment watch expired (410 Gone); restarting.")
+                    break
+                if event["type"] not in ("ADDED", "MODIFIED"):
+                    continue
+                status = event["object"].get("status", {})
+                pods_ready = (
+                    status.get("replicas") == REPLICAS
+                    and status.get("availableReplicas") == REPLICAS
+                )
+                logger.debug(f"Deployment status: {status.get('replicas')} replicas, {status.get('availableReplicas')} available replicas.")
+
+                if pods_ready:
+                    total_pod_ready_time = time.time() - pod_schedule_start_time
+                    logger.info(f"All replicas became ready in {total_pod_ready_time:.2f} seconds.")
+                    return
+        except ApiException as e:
+            if e.status != 410:
+                raise
+            logger.debug("Deployment watch expired (410 Gone); restarting.")
+        finally:
+            response.close()
+            response.release_conn()
+
+    raise RuntimeError(f"Deployment '{DEPLOYMENT}' did not scale to {REPLICAS} replicas within the timeout.")
 
 
 @then("I log the timing metrics for node and pod readiness")
@@ -1,9 +1,11 @@
+import pytest
 from pytest_bdd import given, when, then, scenarios
 from src.utils.logging_util import get_logger
 import time
 from src.utils.config_util import load_config
 
 logger = get_logger(__name__)
+pytestmark = [pytest.mark.k8s, pytest.mark.slow, pytest.mark.xdist_group("scale-test")]
 
 # Link the feature file
 scenarios("../features/scale_down_deployment.feature")